@@ -2,9 +2,9 @@ import funparse.api as fp
 import enum
 
 
-# This Enum functionality will work better if you use SCREAMING_SNAKE_CASE for
-# the names of your enum members (if you don't, your CLI will work in a
-# case-sensitive way :P)
+# Enum members (and their aliases) are looked up by name. An exact match wins;
+# otherwise, case is ignored. If some names differ only in case, the one
+# defined first is picked for inputs which match none of them exactly
 class CommandModes(fp.Enum):  # You can use enum.Enum and similar classes too
     CREATE_USER = enum.auto()
     LIST_USERS = enum.auto()
@@ -30,3 +30,10 @@ saving_for_later.run([
     "some address...",
     "--is-foreigner",
 ])
+
+# 'with_state' doesn't modify 'some_parser' itself, which stays stateless, so
+# you can derive as many differently-stated parsers from it as you want
+some_parser.with_state(
+    user_count=34,
+    user_name="Mary",
+).run(["another address..."])
@@ -1,15 +1,13 @@
 from __future__ import annotations
 
-import contextlib
-from collections.abc import Callable, Sequence, Iterable
+from collections.abc import Callable, Sequence
 from inspect import Parameter
-from types import GenericAlias, UnionType
+from types import FunctionType, GenericAlias, ModuleType, UnionType
 from typing import ParamSpec, TypeVar, Self, Generic, Any, Annotated
 import enum
 import argparse as ap
 import functools
 import inspect
-import builtins
 import typing
 import sys
 
@@ -18,9 +16,6 @@ try:
 except ImportError:
     from typing_extensions import Doc
 
-with contextlib.suppress(ImportError):
-    import docstring_parser as dp   # type: ignore
-
 P = ParamSpec("P")
 T = TypeVar("T")
 U = TypeVar("U")
@@ -51,43 +46,34 @@ class ArgumentParser(ap.ArgumentParser):
         raise RuntimeError(f'{self.prog}: error: {message}')
 
 
-def _is_documentation_annotation(obj: object) -> bool:
-    return obj.__class__.__name__ == "Doc"
-
+def make_argument_name(base_name: str, optional: bool) -> str:
+    return "--" + base_name.replace("_", '-') if optional else base_name
 
-def _first(iterable: Iterable[T], pred: Callable[[T], bool]) -> T | None:
-    """Returns either None or the first item for which pred(item) is true."""
-    return next(filter(pred, iterable), None)   # type: ignore
 
-
-def make_argument_name(base_name: str, optional: bool) -> str:
-    if optional:
-        return "--" + base_name.replace("_", '-')
-    return base_name
+_SIMPLE_DISPATCH: dict[type, tuple[str, Constructor, None]] = {
+    int: ("store", int, None),
+    float: ("store", float, None),
+    str: ("store", str, None),
+}
 
 
 def johnny_simple(
     in_type: type,
     default_val: Any,
 ) -> tuple[str, Constructor, list[str] | None]:
-    match (in_type, default_val):
-        case (builtins.bool, True):
+    if in_type is bool:
+        if default_val is True:
             return "store_false", bool, None
-        case (builtins.bool, False):
+        if default_val is False:
             return "store_true", bool, None
-        case (builtins.bool, Parameter.empty):
+        if default_val is Parameter.empty:
             return "store", _bool_from_str, None
-        case (enum.EnumType() as enum_type, _):
-            return (
-                "store",
-                functools.partial(_enum_from_str, enum_type),
-                list(enum_type),
-            )
-        case (some_type, _) if some_type in (int, float, str):
-            return "store", some_type, None
-        case _:
-            raise RuntimeError(f"unsupported type: {in_type!r}")
-    return ()   # type: ignore
+        raise RuntimeError(f"unsupported type: {in_type!r}")
+    if (hit := _SIMPLE_DISPATCH.get(in_type)) is not None:
+        return hit
+    if isinstance(in_type, enum.EnumType):
+        return "store", _make_enum_converter(in_type), list(in_type)
+    raise RuntimeError(f"unsupported type: {in_type!r}")
 
 
 def johnny_generic(
@@ -102,22 +88,44 @@ def johnny_generic(
     return ()   # type: ignore
 
 
+_BOOL_TABLE: dict[str, bool] = {
+    "y": True,
+    "yes": True,
+    "true": True,
+    "1": True,
+    "n": False,
+    "no": False,
+    "false": False,
+    "0": False,
+}
+
+
 def _bool_from_str(word: str) -> bool:
-    match word.lower():
-        case "y" | "yes" | "true" | "1":
-            return True
-        case "n" | "no" | "false" | "0":
-            return False
-        case _:
-            raise ValueError(f"invalid value for boolean: {word!r}")
+    res = _BOOL_TABLE.get(word.lower())
+    if res is None:
+        raise ValueError(f"invalid value for boolean: {word!r}")
+    return res
 
 
-def _enum_from_str(enum_type: type[enum.Enum], word: str) -> enum.Enum:
-    with contextlib.suppress(KeyError):
-        return enum_type[word]
-    with contextlib.suppress(KeyError):
-        return enum_type[word.upper()]
-    raise ValueError(f"no name {word!r} in {enum_type!r}")
+def _make_enum_converter(enum_type: type[enum.Enum]) -> Constructor[str, enum.Enum]:
+    # '__members__' includes aliases. Exact names take precedence, and among
+    # names differing only in case, the first one defined wins
+    members = enum_type.__members__
+    lowered: dict[str, enum.Enum] = {}
+    for member_name, member in members.items():
+        lowered.setdefault(member_name.lower(), member)
+
+    def convert(word: str) -> enum.Enum:
+        member = members.get(word)
+        if member is None:
+            member = lowered.get(word.lower())
+        if member is None:
+            raise ValueError(f"no name {word!r} in {enum_type!r}")
+        return member
+
+    # argparse names the converter in its error messages
+    convert.__name__ = enum_type.__name__
+    return convert
 
 
 def _is_optional_type(raw_type: UnionType) -> bool:
@@ -128,91 +136,112 @@ def _unwrap_optional_type(opt: UnionType) -> type:
     return opt.__args__[opt.__args__.index(type(None)) - 1]
 
 
+_cached_signature = functools.lru_cache(2048)(inspect.signature)
+
+
+def _signature(fn: Callable) -> inspect.Signature:
+    # Only plain functions are memoized: they hash and compare by identity,
+    # while other callables may be unhashable or equal to distinct ones
+    if type(fn) is FunctionType:
+        return _cached_signature(fn)
+    return inspect.signature(fn)
+
+
+@functools.lru_cache(2048)
+def _cached_dp_parse(text: str, style: DocstringStyle) -> Any:
+    try:
+        import docstring_parser as dp   # type: ignore
+    except ImportError:
+        raise ModuleNotFoundError("docstring_parser") from None
+    return dp.parse(text, style._to_dp(dp))
+
+
 def _make_parser(
     fn: Callable[P, T],
-    ignore: Sequence[str] | None,
+    ignore: tuple[str, ...] | None,
     parser_type: type[ap.ArgumentParser],
     parse_docstring: DocstringStyle | None,
 ) -> tuple[ap.ArgumentParser, str | None]:
-    if parse_docstring is None:
+    if parse_docstring is None or fn.__doc__ is None:
         description = fn.__doc__
         arg_help = {}
-    elif "docstring_parser" not in sys.modules:
-        raise ModuleNotFoundError("docstring_parser")
     else:
-        docstring = dp.parse(fn.__doc__, parse_docstring._to_dp())
+        docstring = _cached_dp_parse(fn.__doc__, parse_docstring)
         description = docstring.long_description or docstring.short_description
-        arg_help = {p.arg_name: p.description for p in docstring.params}
+        arg_help = {sys.intern(p.arg_name): p.description for p in docstring.params}
 
     parser = parser_type(description=description, exit_on_error=False)
-    signature = inspect.signature(fn)
+    signature = _signature(fn)
     vararg_name = None
 
+    # Hoisted out of the loop, so each use is a local lookup
+    empty = Parameter.empty
+    var_positional = Parameter.VAR_POSITIONAL
+    get_origin = typing.get_origin
+    get_args = typing.get_args
+    annotated = Annotated
+
     for name, body in signature.parameters.items():
         if ignore is not None and name in ignore:
             continue
         raw_type = body.annotation
         default = body.default
 
-        if isinstance(raw_type, UnionType):
+        if type(raw_type) is UnionType:
             if not _is_optional_type(raw_type):
                 raise TypeError(f"unsupported union: {raw_type!r}")
             raw_type = _unwrap_optional_type(raw_type)
-            if default is Parameter.empty:
+            if default is empty:
                 default = None
 
-        match raw_type:
-            case Parameter.empty:
-                raise SyntaxError(f"untyped parameters are not supported: {name!r}")
-            case type():
-                action, _type, choices = johnny_simple(raw_type, default)
-            case alias if typing.get_origin(alias) is Annotated:
-                inner_type, *other_type_args = typing.get_args(alias)
-                action, _type, choices = johnny_simple(inner_type, default)
-                doc_annotation = _first(other_type_args, _is_documentation_annotation)
-                if doc_annotation is not None:
-                    arg_help[name] = doc_annotation.documentation
-                raw_type = inner_type   # for help message generation
-            case GenericAlias():
-                action, _type, choices = johnny_generic(raw_type, default)
-
-        add_arg_params = {}
-        if default is not Parameter.empty:
-            add_arg_params["default"] = default
-
-        match action:
-            case "append":
-                add_arg_params["choices"] = choices
-                add_arg_params["type"] = _type
-            case "store":
-                add_arg_params["choices"] = choices
-                add_arg_params["type"] = _type
-            case "store_true" | "store_false":
-                pass
-            case other:
-                raise ValueError(f"unsupported action: {other!r}")
+        # Cheap identity checks go first, as plain classes are the common case
+        raw_type_type = type(raw_type)
+        if raw_type is empty:
+            raise SyntaxError(f"untyped parameters are not supported: {name!r}")
+        elif raw_type_type is type or isinstance(raw_type, type):
+            action, _type, choices = johnny_simple(raw_type, default)
+        elif raw_type_type is GenericAlias:
+            action, _type, choices = johnny_generic(raw_type, default)
+        elif get_origin(raw_type) is annotated:
+            inner_type, *other_type_args = get_args(raw_type)
+            action, _type, choices = johnny_simple(inner_type, default)
+            for metadata in other_type_args:
+                if type(metadata).__name__ == "Doc":
+                    arg_help[name] = metadata.documentation
+                    break
+            raw_type = inner_type   # for help message generation
+        else:
+            raise RuntimeError(f"unsupported type: {raw_type!r}")
 
-        if body.kind == Parameter.VAR_POSITIONAL:
-            add_arg_params["nargs"] = "+"
+        if body.kind is var_positional:
+            nargs = "+"
             vararg_name = name
+        else:
+            nargs = None
 
         type_name = raw_type.__name__
         help_type = f"{type_name}[{_type}]" if isinstance(raw_type, GenericAlias) else type_name
-        match (arg_help.get(name, None), default):
-            case (None, Parameter.empty):
-                add_arg_params["help"] = f"{help_type}"
-            case (None, default_value):
-                add_arg_params["help"] = f"{help_type} (default={default_value})"
-            case (help_str, Parameter.empty):
-                add_arg_params["help"] = f"{help_type}: {help_str}"
-            case (help_str, default_value):
-                add_arg_params["help"] = f"{help_type} (default={default_value}): {help_str}"
-
-        added_arg = parser.add_argument(
-            make_argument_name(name, default is not Parameter.empty),
-            action=action,
-            **add_arg_params,
-        )
+        help_default = "" if default is empty else f" (default={default})"
+        help_str = arg_help.get(name, None)
+        help_suffix = "" if help_str is None else f": {help_str}"
+        help_ = f"{help_type}{help_default}{help_suffix}"
+
+        arg_name = make_argument_name(name, default is not empty)
+        match action:
+            case "append" | "store":
+                parser.add_argument(
+                    arg_name,
+                    action=action,
+                    type=_type,
+                    choices=choices,
+                    default=None if default is empty else default,
+                    nargs=nargs,
+                    help=help_,
+                )
+            case "store_true" | "store_false":
+                parser.add_argument(arg_name, action=action, default=default, help=help_)
+            case other:
+                raise ValueError(f"unsupported action: {other!r}")
 
     return parser, vararg_name
 
@@ -264,6 +293,29 @@ def as_arg_parser_inner(
     ignore: Sequence[str] | None,
     parser_type: type[ap.ArgumentParser],
     parse_docstring: DocstringStyle | None,
+) -> Command[P, T]:
+    # Commands never mutate themselves nor their parsers, so those made from
+    # plain functions are cached and thus shared between decorations with the
+    # same arguments, just like parsers are shared with the Commands derived
+    # through 'with_state'. Other callables may be unhashable or equal to
+    # distinct ones, so they always get a fresh Command.
+    make_command = typing.cast(
+        Callable[..., Command[P, T]],
+        _cached_make_command if type(fn) is FunctionType else _make_command,
+    )
+    return make_command(
+        fn=fn,
+        ignore=None if ignore is None else tuple(ignore),
+        parser_type=parser_type,
+        parse_docstring=parse_docstring,
+    )
+
+
+def _make_command(
+    fn: Callable[P, T],
+    ignore: tuple[str, ...] | None,
+    parser_type: type[ap.ArgumentParser],
+    parse_docstring: DocstringStyle | None,
 ) -> Command[P, T]:
     parser, vararg_name = _make_parser(
         fn=fn,
@@ -278,16 +330,15 @@ def as_arg_parser_inner(
     )
 
 
+_cached_make_command = functools.lru_cache(maxsize=512)(_make_command)
+
+
 class Command(Generic[P, T]):
     __slots__ = [
         "_state",
         "_fn",
         "_parser",
         "_vararg_name",
-        "print_usage",
-        "print_help",
-        "format_usage",
-        "format_help",
     ]
 
     def __init__(
@@ -301,13 +352,24 @@ class Command(Generic[P, T]):
         self._parser = parser
         self._vararg_name = vararg_name
         self._state = state or {}
-        self.print_usage = parser.print_usage
-        self.print_help = parser.print_help
-        self.format_usage = parser.format_usage
-        self.format_help = parser.format_help
+
+    @property
+    def print_usage(self):
+        return self._parser.print_usage
+
+    @property
+    def print_help(self):
+        return self._parser.print_help
+
+    @property
+    def format_usage(self):
+        return self._parser.format_usage
+
+    @property
+    def format_help(self):
+        return self._parser.format_help
 
     def with_state(self: Self, **kwargs) -> Command[P, T]:
-        self._state = kwargs
         return Command(
             fn=self._fn,
             parser=self._parser,
@@ -316,12 +378,14 @@ class Command(Generic[P, T]):
         )
 
     def run(self: Self, cmd_args: list[str] | None = None) -> T:
-        parsed_args = vars(self._parser.parse_args(cmd_args))
+        parsed_args = self._parser.parse_args(cmd_args).__dict__
         if self._vararg_name is not None:
             varargs = parsed_args.pop(self._vararg_name)
         else:
             varargs = ()
 
+        if not self._state:
+            return self._fn(*varargs, **parsed_args)
         return self._fn(
             *varargs,
             **self._state,
@@ -346,18 +410,16 @@ class DocstringStyle(Enum):
     NUMPYDOC = enum.auto()
     EPYDOC = enum.auto()
 
-    def _to_dp(self):
-
-        match self:
-            case DocstringStyle.AUTO:
-                return dp.DocstringStyle.AUTO
-            case DocstringStyle.REST:
-                return dp.DocstringStyle.REST
-            case DocstringStyle.GOOGLE:
-                return dp.DocstringStyle.GOOGLE
-            case DocstringStyle.NUMPYDOC:
-                return dp.DocstringStyle.NUMPYDOC
-            case DocstringStyle.EPYDOC:
-                return dp.DocstringStyle.EPYDOC
-            case _:
-                raise NotImplementedError("Can't convert DocstringStyle")
+    @classmethod
+    @functools.lru_cache(1)
+    def _map(cls, dp: ModuleType):
+        return {
+            cls.AUTO: dp.DocstringStyle.AUTO,
+            cls.REST: dp.DocstringStyle.REST,
+            cls.GOOGLE: dp.DocstringStyle.GOOGLE,
+            cls.NUMPYDOC: dp.DocstringStyle.NUMPYDOC,
+            cls.EPYDOC: dp.DocstringStyle.EPYDOC,
+        }
+
+    def _to_dp(self, dp: ModuleType):
+        return type(self)._map(dp)[self]